@@ -1,8 +1,15 @@
 import streamlit as st
 import json
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import contextlib
+import copy
+import os
+import re
+import sqlite3
+import threading
 import time
+import uuid
 import random
 
 # ============================================================================
@@ -16,6 +23,37 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Career goals the roadmap generator recognizes
+CAREER_GOALS = [
+    "Data Scientist",
+    "UX Designer",
+    "Full Stack Developer",
+    "Cloud Architect",
+    "Machine Learning Engineer",
+    "Cybersecurity Analyst",
+    "Product Manager"
+]
+
+# Popular goals precomputed in the background when the server starts.
+# Override with a comma-separated PATHFINDER_WARMUP_GOALS (empty disables warm-up).
+DEFAULT_WARMUP_GOALS = CAREER_GOALS
+WARMUP_GOALS = [
+    goal.strip()
+    for goal in os.environ.get("PATHFINDER_WARMUP_GOALS", ",".join(DEFAULT_WARMUP_GOALS)).split(",")
+    if goal.strip()
+]
+
+# SQLite database holding the full-text index of stored roadmaps and conversations
+SEARCH_INDEX_PATH = os.environ.get("PATHFINDER_INDEX_PATH", "pathfinder_index.db")
+
+# The search panel exposes every user's stored sessions, so it is off unless a
+# deployment reachable only by advisors sets PATHFINDER_ADVISOR_SEARCH=1
+ADVISOR_SEARCH_ENABLED = os.environ.get("PATHFINDER_ADVISOR_SEARCH", "") == "1"
+
+# Chat turns and roadmaps are written to the index (and kept on disk indefinitely)
+# only when PATHFINDER_INDEX_SESSIONS=1
+SESSION_INDEXING_ENABLED = os.environ.get("PATHFINDER_INDEX_SESSIONS", "") == "1"
+
 # ============================================================================
 # CUSTOM STYLING
 # ============================================================================
@@ -111,7 +149,7 @@ def initialize_session_state():
         st.session_state.roadmap = None
     
     if "conversation_id" not in st.session_state:
-        st.session_state.conversation_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        st.session_state.conversation_id = uuid.uuid4().hex
     
     if "roadmap_history" not in st.session_state:
         st.session_state.roadmap_history = []
@@ -124,11 +162,8 @@ class MockDataGenerator:
     """Generates mock roadmaps for demo mode"""
     
     @staticmethod
-    def generate_mock_roadmap(user_input: str) -> Dict:
-        """Generate a mock roadmap based on user input"""
-        time.sleep(1)  # Simulate API delay
-        
-        # Extract career goal from input
+    def detect_career_goal(user_input: str) -> str:
+        """Extract the career goal a user input maps to"""
         career_goal = "Data Scientist"
         if "ux" in user_input.lower() or "design" in user_input.lower():
             career_goal = "UX Designer"
@@ -144,6 +179,14 @@ class MockDataGenerator:
             career_goal = "Cybersecurity Analyst"
         elif "product manager" in user_input.lower() or "pm" in user_input.lower():
             career_goal = "Product Manager"
+        return career_goal
+    
+    @staticmethod
+    def generate_mock_roadmap(user_input: str) -> Dict:
+        """Generate a mock roadmap based on user input"""
+        time.sleep(1)  # Simulate API delay
+        
+        career_goal = MockDataGenerator.detect_career_goal(user_input)
         
         return {
             "career_goal": career_goal,
@@ -414,9 +457,42 @@ class IntentDetector:
 class RoadmapVisualizer:
     """Renders roadmap components"""
     
+    PRIORITY_CLASSES = {'Essential': 'priority-essential', 'Recommended': 'priority-recommended', 'Optional': 'priority-optional'}
+    
+    @staticmethod
+    def skills_html(skills: List[str]) -> str:
+        """Build the skill tag fragment for a phase"""
+        return " ".join([f'<span class="skill-tag">{s}</span>' for s in skills])
+    
+    @staticmethod
+    def resource_html(resource: Dict) -> str:
+        """Build the fragment for a single resource"""
+        priority = resource.get('priority', 'Optional')
+        return f"""
+                        <div class="resource-item">
+                            <span class="{RoadmapVisualizer.PRIORITY_CLASSES.get(priority, '')}">[{priority.upper()}]</span>
+                            <strong>{resource.get('name', 'Resource')}</strong> ({resource.get('type', 'Resource')})
+                            <br><small>{resource.get('description', '')}</small>
+                        </div>
+                        """
+    
+    @staticmethod
+    def render_fragments(roadmap: Dict) -> Dict:
+        """Pre-render the HTML fragments of every phase, keyed by phase position"""
+        fragments = {}
+        for i, phase in enumerate(roadmap.get('phases', []), 1):
+            fragments[i] = {
+                "skills": RoadmapVisualizer.skills_html(phase.get('skills', [])),
+                "resources": [RoadmapVisualizer.resource_html(r) for r in phase.get('resources', [])]
+            }
+        return fragments
+    
     @staticmethod
-    def render_complete(roadmap: Dict):
+    def render_complete(roadmap: Dict, fragments: Optional[Dict] = None):
         """Render complete roadmap"""
+        if fragments is None:
+            fragments = RoadmapVisualizer.render_fragments(roadmap)
+        
         # Header
         st.markdown(f"## {roadmap.get('career_goal', 'Career Roadmap')}")
         if roadmap.get('overview'):
@@ -478,6 +554,7 @@ class RoadmapVisualizer:
         total = len(roadmap.get('phases', []))
         for i, phase in enumerate(roadmap.get('phases', []), 1):
             progress = (i / total) * 100
+            phase_fragments = fragments[i]
             
             with st.expander(f"Phase {phase.get('phase_id', i)}: {phase.get('title', 'Phase')}", expanded=(i == 1)):
                 st.progress(progress / 100)
@@ -500,21 +577,11 @@ class RoadmapVisualizer:
                 
                 if phase.get('skills'):
                     st.markdown("**Skills**")
-                    html = " ".join([f'<span class="skill-tag">{s}</span>' for s in phase['skills']])
-                    st.markdown(html, unsafe_allow_html=True)
+                    st.markdown(phase_fragments["skills"], unsafe_allow_html=True)
                 
                 if phase.get('resources'):
                     st.markdown("**Resources**")
-                    for r in phase['resources']:
-                        priority = r.get('priority', 'Optional')
-                        classes = {'Essential': 'priority-essential', 'Recommended': 'priority-recommended', 'Optional': 'priority-optional'}
-                        html = f"""
-                        <div class="resource-item">
-                            <span class="{classes.get(priority, '')}">[{priority.upper()}]</span>
-                            <strong>{r.get('name', 'Resource')}</strong> ({r.get('type', 'Resource')})
-                            <br><small>{r.get('description', '')}</small>
-                        </div>
-                        """
+                    for html in phase_fragments["resources"]:
                         st.markdown(html, unsafe_allow_html=True)
                 
                 if phase.get('projects'):
@@ -547,6 +614,480 @@ class RoadmapVisualizer:
             for metric in roadmap['success_metrics']:
                 st.markdown(f"- {metric}")
 
+# ============================================================================
+# ROADMAP CACHE & WARM-UP
+# ============================================================================
+
+class RoadmapCache:
+    """Process-wide cache of generated roadmaps, rendered fragments and exports"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._pending: Dict[str, threading.Event] = {}
+        self._warmup_thread: Optional[threading.Thread] = None
+        self.warmup_total = 0
+        self.warmup_done = 0
+        self.warmup_warmed = 0
+        self.warmup_started: Optional[float] = None
+        self.warmup_finished: Optional[float] = None
+        self.warmup_errors: List[str] = []
+
+    def put(self, roadmap: Dict) -> Dict:
+        """Precompute fragments and export for a roadmap and cache them"""
+        entry = {
+            "roadmap": roadmap,
+            "fragments": RoadmapVisualizer.render_fragments(roadmap),
+            "export": json.dumps(roadmap, indent=2)
+        }
+        with self._lock:
+            self._entries[roadmap["career_goal"]] = entry
+        return entry
+
+    def get(self, career_goal: str) -> Optional[Dict]:
+        """Return the cached entry for a career goal"""
+        with self._lock:
+            return self._entries.get(career_goal)
+
+    def lookup(self, roadmap: Dict) -> Optional[Dict]:
+        """Return the cached entry only if it matches this exact roadmap"""
+        entry = self.get(roadmap.get("career_goal"))
+        if entry and entry["roadmap"] == roadmap:
+            return entry
+        return None
+
+    def _fetch(self, user_input: str) -> Dict:
+        """Return the entry for an input, generating it at most once per goal"""
+        career_goal = MockDataGenerator.detect_career_goal(user_input)
+        while True:
+            with self._lock:
+                entry = self._entries.get(career_goal)
+                if entry is not None:
+                    return entry
+                pending = self._pending.get(career_goal)
+                if pending is None:
+                    pending = self._pending[career_goal] = threading.Event()
+                    break
+            # Another thread is already generating this goal; wait and re-check
+            pending.wait()
+        try:
+            return self.put(MockDataGenerator.generate_mock_roadmap(user_input))
+        finally:
+            with self._lock:
+                del self._pending[career_goal]
+            pending.set()
+
+    def get_or_generate(self, user_input: str) -> Dict:
+        """Serve a roadmap from the cache, generating and caching it on a miss"""
+        entry = self._fetch(user_input)
+        # Sessions get their own copy so the shared entry is never mutated
+        return copy.deepcopy(entry["roadmap"])
+
+    def start_warmup(self, goals: List[str]):
+        """Precompute roadmaps for popular goals in a background thread"""
+        known = {goal.lower(): goal for goal in CAREER_GOALS}
+        with self._lock:
+            if self._warmup_thread is not None:
+                return
+            # Unrecognized goals would silently fall back to the default roadmap
+            self.warmup_errors.extend(
+                f"{goal}: not a recognized career goal" for goal in goals if goal.lower() not in known
+            )
+            goals = list(dict.fromkeys(known[goal.lower()] for goal in goals if goal.lower() in known))
+            if not goals:
+                return
+            self.warmup_total = len(goals)
+            self.warmup_started = time.time()
+            self._warmup_thread = threading.Thread(
+                target=self._warmup, args=(list(goals),), name="roadmap-warmup", daemon=True
+            )
+        self._warmup_thread.start()
+
+    def _warmup(self, goals: List[str]):
+        """Warm-up worker; must not call any Streamlit APIs"""
+        for goal in goals:
+            try:
+                self._fetch(goal)
+                self.warmup_warmed += 1
+            except Exception as e:
+                self.warmup_errors.append(f"{goal}: {e}")
+            with self._lock:
+                self.warmup_done += 1
+        self.warmup_finished = time.time()
+
+    def warmup_status(self) -> Dict:
+        """Snapshot of warm-up progress"""
+        finished = self.warmup_finished
+        elapsed = ((finished or time.time()) - self.warmup_started) if self.warmup_started else 0.0
+        return {
+            "total": self.warmup_total,
+            "done": self.warmup_done,
+            "warmed": self.warmup_warmed,
+            "finished": finished is not None,
+            "elapsed": elapsed,
+            "errors": list(self.warmup_errors)
+        }
+
+@st.cache_resource
+def get_roadmap_cache() -> RoadmapCache:
+    """Create the shared roadmap cache once per server and kick off warm-up"""
+    cache = RoadmapCache()
+    cache.start_warmup(WARMUP_GOALS)
+    return cache
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+
+class SearchIndex:
+    """SQLite FTS5 index over stored roadmaps and conversation turns"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            conversation_id TEXT NOT NULL,
+            role TEXT,
+            created_at TEXT NOT NULL,
+            career_goal TEXT NOT NULL DEFAULT '',
+            phase_titles TEXT NOT NULL DEFAULT '',
+            skills TEXT NOT NULL DEFAULT '',
+            resources TEXT NOT NULL DEFAULT '',
+            content TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS idx_documents_conversation ON documents(conversation_id, id);
+        CREATE INDEX IF NOT EXISTS idx_documents_kind ON documents(kind, id);
+        CREATE INDEX IF NOT EXISTS idx_documents_goal ON documents(career_goal, id);
+        CREATE INDEX IF NOT EXISTS idx_documents_created ON documents(created_at);
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+            career_goal, phase_titles, skills, resources, content, kind,
+            content='documents', content_rowid='id', tokenize='porter unicode61', prefix='2 3'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+            INSERT INTO documents_fts(rowid, career_goal, phase_titles, skills, resources, content, kind)
+            VALUES (new.id, new.career_goal, new.phase_titles, new.skills, new.resources, new.content, new.kind);
+        END;
+        CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+            INSERT INTO documents_fts(documents_fts, rowid, career_goal, phase_titles, skills, resources, content, kind)
+            VALUES ('delete', old.id, old.career_goal, old.phase_titles, old.skills, old.resources, old.content, old.kind);
+        END;
+        CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+            INSERT INTO documents_fts(documents_fts, rowid, career_goal, phase_titles, skills, resources, content, kind)
+            VALUES ('delete', old.id, old.career_goal, old.phase_titles, old.skills, old.resources, old.content, old.kind);
+            INSERT INTO documents_fts(rowid, career_goal, phase_titles, skills, resources, content, kind)
+            VALUES (new.id, new.career_goal, new.phase_titles, new.skills, new.resources, new.content, new.kind);
+        END;
+    """
+
+    # bm25 column weights: career_goal, phase_titles, skills, resources, content, kind
+    RANK = "bm25(10.0, 5.0, 5.0, 3.0, 1.0, 0.0)"
+
+    # Only the most recent matches are ranked, so search cost stays bounded
+    # no matter how many stored documents match a common term
+    MAX_CANDIDATES = 2000
+
+    # Idle read connections kept open for reuse across searches
+    READ_POOL_SIZE = 4
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._readers: List[sqlite3.Connection] = []
+        self.error: Optional[str] = None
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.execute(
+                "INSERT INTO documents_fts(documents_fts, rank) VALUES ('rank', ?)", (self.RANK,)
+            )
+            self._conn.commit()
+        except sqlite3.OperationalError as e:
+            # Unwritable paths and Python builds without FTS5 keep the app running with search disabled
+            self.error = str(e)
+
+    @property
+    def available(self) -> bool:
+        return self.error is None
+
+    @contextlib.contextmanager
+    def _reader(self):
+        """Borrow a pooled read connection; with WAL, searches never wait on the write lock"""
+        with self._pool_lock:
+            conn = self._readers.pop() if self._readers else None
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA query_only=1")
+        try:
+            yield conn
+        finally:
+            with self._pool_lock:
+                if len(self._readers) < self.READ_POOL_SIZE:
+                    self._readers.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def _insert(self, kind: str, conversation_id: str, created_at: datetime, role: Optional[str] = None,
+                career_goal: str = "", phase_titles: str = "", skills: str = "", resources: str = "",
+                content: str = ""):
+        """Insert one document; the FTS index is updated incrementally by trigger"""
+        if not self.available:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO documents (kind, conversation_id, role, created_at, career_goal, "
+                "phase_titles, skills, resources, content) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, conversation_id, role, created_at.isoformat(timespec="seconds"), career_goal,
+                 phase_titles, skills, resources, content)
+            )
+            self._conn.commit()
+
+    def add_roadmap(self, conversation_id: str, roadmap: Dict, created_at: datetime):
+        """Index a stored roadmap by goal, phase titles, skills and resource names"""
+        phases = roadmap.get("phases", [])
+        self._insert(
+            "roadmap", conversation_id, created_at,
+            career_goal=roadmap.get("career_goal", ""),
+            phase_titles="\n".join(p.get("title", "") for p in phases),
+            skills="\n".join(s for p in phases for s in p.get("skills", [])),
+            resources="\n".join(r.get("name", "") for p in phases for r in p.get("resources", [])),
+            content=roadmap.get("overview", "")
+        )
+
+    def add_message(self, conversation_id: str, role: str, content: str, created_at: datetime,
+                    career_goal: str = ""):
+        """Index a single conversation turn"""
+        self._insert("message", conversation_id, created_at, role=role, career_goal=career_goal,
+                     content=content)
+
+    @staticmethod
+    def _match_expression(query: str) -> Optional[str]:
+        """Turn free text into an FTS5 query over the text columns"""
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return None
+        # Two- and three-character terms match as prefixes, served by the prefix index.
+        # Single characters and longer terms match whole (stemmed) tokens, since a prefix
+        # without an index makes FTS5 materialize the matches of every term it covers
+        expression = " ".join(f'"{term}"*' if 2 <= len(term) <= 3 else f'"{term}"' for term in terms)
+        # The kind column only exists for filtering, so free text never matches it
+        return f"{{career_goal phase_titles skills resources content}} : ({expression})"
+
+    @staticmethod
+    def _id_bounds(conn: sqlite3.Connection, since: Optional[date], until: Optional[date]) -> Optional[tuple]:
+        """Translate an inclusive date range into a document id range, or None if it is empty.
+        Ids are assigned in insertion order, so they follow created_at."""
+        low, high = 0, None
+        if since:
+            row = conn.execute(
+                "SELECT id FROM documents WHERE created_at >= ? ORDER BY created_at, id LIMIT 1",
+                (since.isoformat(),)
+            ).fetchone()
+            if row is None:
+                return None
+            low = row[0]
+        if until:
+            row = conn.execute(
+                "SELECT id FROM documents WHERE created_at < ? ORDER BY created_at DESC, id DESC LIMIT 1",
+                ((until + timedelta(days=1)).isoformat(),)
+            ).fetchone()
+            if row is None:
+                return None
+            high = row[0]
+        return low, high
+
+    def search(self, query: str, kind: Optional[str] = None, career_goal: Optional[str] = None,
+               conversation_id: Optional[str] = None, since: Optional[date] = None,
+               until: Optional[date] = None, page: int = 1, page_size: int = 10) -> Dict:
+        """Ranked search with filters; an empty query browses documents by recency"""
+        found = {"results": [], "page": page, "has_more": False, "truncated": False}
+        if not self.available:
+            return found
+
+        with self._reader() as conn:
+            bounds = self._id_bounds(conn, since, until)
+            if bounds is None:
+                return found
+
+            match = self._match_expression(query)
+            # Range constraints on the FTS rowid let FTS5 seek straight to the date window
+            id_column = "documents_fts.rowid" if match else "d.id"
+            filters, params = [f"{id_column} >= ?"], [bounds[0]]
+            if bounds[1] is not None:
+                filters.append(f"{id_column} <= ?")
+                params.append(bounds[1])
+            if kind:
+                filters.append("d.kind = ?")
+                params.append(kind)
+            if career_goal:
+                filters.append("d.career_goal = ?")
+                params.append(career_goal)
+            if conversation_id:
+                filters.append("d.conversation_id = ?")
+                params.append(conversation_id)
+            where = "".join(f" AND {f}" for f in filters)
+            offset = (page - 1) * page_size
+
+            if match:
+                # Kind and goal filters are also expressed as column terms so FTS5
+                # narrows the doclists itself; matches are walked newest-first and
+                # only the capped candidate set is scored and sorted
+                narrowed = match
+                if kind:
+                    narrowed += f' AND kind:"{kind}"'
+                if career_goal:
+                    narrowed += ' AND career_goal:"{}"'.format(career_goal.replace('"', '""'))
+                candidates = conn.execute(
+                    "SELECT documents_fts.rowid, documents_fts.rank "
+                    "FROM documents_fts CROSS JOIN documents d ON d.id = documents_fts.rowid "
+                    f"WHERE documents_fts MATCH ?{where} "
+                    "ORDER BY documents_fts.rowid DESC LIMIT ?",
+                    [narrowed] + params + [self.MAX_CANDIDATES + 1]
+                ).fetchall()
+                found["truncated"] = len(candidates) > self.MAX_CANDIDATES
+                ranked = sorted(candidates[:self.MAX_CANDIDATES], key=lambda c: c[1])
+                ids = [c[0] for c in ranked[offset:offset + page_size]]
+                found["has_more"] = len(ranked) > offset + page_size
+            else:
+                order = "d.id" if conversation_id else "d.id DESC"
+                # Fetch one extra row to learn whether another page exists without counting every match
+                rows = conn.execute(
+                    f"SELECT d.id FROM documents d WHERE 1{where} ORDER BY {order} LIMIT ? OFFSET ?",
+                    params + [page_size + 1, offset]
+                ).fetchall()
+                ids = [r[0] for r in rows[:page_size]]
+                found["has_more"] = len(rows) > page_size
+
+            for doc_id in ids:
+                r = conn.execute(
+                    "SELECT kind, conversation_id, role, created_at, career_goal, "
+                    "substr(coalesce(nullif(content, ''), career_goal), 1, 160) "
+                    "FROM documents WHERE id = ?", (doc_id,)
+                ).fetchone()
+                snippet = r[5]
+                if match:
+                    snippet = conn.execute(
+                        "SELECT snippet(documents_fts, -1, '**', '**', '…', 16) FROM documents_fts "
+                        "WHERE documents_fts MATCH ? AND rowid = ?", (match, doc_id)
+                    ).fetchone()[0]
+                found["results"].append({"id": doc_id, "kind": r[0], "conversation_id": r[1], "role": r[2],
+                                         "created_at": r[3], "career_goal": r[4], "snippet": snippet})
+        return found
+
+@st.cache_resource
+def get_search_index() -> SearchIndex:
+    """Open the shared search index once per server"""
+    return SearchIndex(SEARCH_INDEX_PATH)
+
+def record_message(role: str, content: str, career_goal: Optional[str] = None):
+    """Append a message to the session and index it, by default under the current goal"""
+    st.session_state.messages.append({"role": role, "content": content})
+    if not SESSION_INDEXING_ENABLED:
+        return
+    if career_goal is None:
+        roadmap = st.session_state.roadmap
+        career_goal = roadmap.get("career_goal", "") if roadmap else ""
+    get_search_index().add_message(
+        st.session_state.conversation_id, role, content, datetime.now(), career_goal=career_goal
+    )
+
+def record_roadmap(roadmap: Dict):
+    """Store a generated roadmap in the session history and index it"""
+    timestamp = datetime.now()
+    st.session_state.roadmap_history.append({"timestamp": timestamp, "roadmap": roadmap})
+    if SESSION_INDEXING_ENABLED:
+        get_search_index().add_roadmap(st.session_state.conversation_id, roadmap, timestamp)
+
+SEARCH_KINDS = {"All": None, "Roadmaps": "roadmap", "Conversations": "message"}
+
+def run_search(page: int = 1):
+    """Run the advisor search for the current parameters and keep the results"""
+    params = st.session_state.search_params
+    st.session_state.search_results = get_search_index().search(
+        params["query"],
+        kind=params["kind"],
+        career_goal=params["career_goal"],
+        conversation_id=params["conversation_id"],
+        since=params["since"],
+        until=params["until"],
+        page=page
+    )
+
+def submit_search():
+    """Start a new search from the form values, back on the first page"""
+    goal = st.session_state.search_goal
+    st.session_state.search_params = {
+        "query": st.session_state.search_query,
+        "kind": SEARCH_KINDS[st.session_state.search_kind],
+        "career_goal": None if goal == "All" else goal,
+        "conversation_id": None,
+        "since": st.session_state.search_since,
+        "until": st.session_state.search_until
+    }
+    run_search()
+
+def open_session(conversation_id: str):
+    """Show every indexed document of one session"""
+    st.session_state.search_params = {
+        "query": "", "kind": None, "career_goal": None, "conversation_id": conversation_id,
+        "since": None, "until": None
+    }
+    run_search()
+
+def render_search_panel():
+    """Render the advisor search panel; searches run only on explicit actions"""
+    index = get_search_index()
+    if not index.available:
+        st.warning(f"Search unavailable: {index.error}")
+        return
+
+    with st.form("search_form"):
+        st.text_input("Goal, skill or resource", key="search_query")
+        st.selectbox("Type", list(SEARCH_KINDS), key="search_kind")
+        st.selectbox("Career goal", ["All"] + CAREER_GOALS, key="search_goal")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.date_input("From", value=None, key="search_since")
+        with col2:
+            st.date_input("To", value=None, key="search_until")
+        st.form_submit_button("Search", on_click=submit_search, use_container_width=True)
+
+    found = st.session_state.get("search_results")
+    if found is None:
+        return
+
+    session = st.session_state.search_params["conversation_id"]
+    if session:
+        st.caption(f"Session `{session}`")
+        st.button("Back to results", on_click=submit_search, use_container_width=True)
+
+    if found["truncated"]:
+        st.info(
+            f"Showing the most recent {SearchIndex.MAX_CANDIDATES} matches. "
+            "Narrow your filters or dates to reach older sessions."
+        )
+    if not found["results"]:
+        st.caption("No matches")
+    for r in found["results"]:
+        label = "Roadmap" if r["kind"] == "roadmap" else (r["role"] or "message").capitalize()
+        st.markdown(f"**{r['career_goal'] or label}** · {label} · {r['created_at'].replace('T', ' ')}")
+        st.caption(r["snippet"])
+        if not session:
+            st.button("Open session", key=f"open_session_{r['id']}", on_click=open_session,
+                      args=(r["conversation_id"],))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if found["page"] > 1:
+            st.button("Previous", on_click=run_search, args=(found["page"] - 1,), use_container_width=True)
+    with col2:
+        if found["has_more"]:
+            st.button("Next", on_click=run_search, args=(found["page"] + 1,), use_container_width=True)
+
 # ============================================================================
 # SIDEBAR
 # ============================================================================
@@ -561,6 +1102,18 @@ def render_sidebar():
         st.success("🎮 Demo Mode Active")
         st.caption("Using mock data (100% FREE!)")
         
+        warmup = get_roadmap_cache().warmup_status()
+        if warmup["total"]:
+            if warmup["finished"]:
+                st.caption(f"⚡ {warmup['warmed']} popular roadmaps precomputed in {warmup['elapsed']:.1f}s")
+            else:
+                st.progress(
+                    warmup["done"] / warmup["total"],
+                    text=f"Precomputing popular roadmaps ({warmup['done']}/{warmup['total']})"
+                )
+        for error in warmup["errors"]:
+            st.warning(f"Warm-up failed for {error}")
+        
         st.markdown("---")
         st.subheader("About")
         st.info("""
@@ -579,11 +1132,13 @@ def render_sidebar():
         if st.button("New Roadmap", use_container_width=True):
             st.session_state.roadmap = None
             st.session_state.messages = []
+            st.session_state.conversation_id = uuid.uuid4().hex
             st.rerun()
         
         if st.session_state.get('roadmap'):
             if st.button("Export JSON", use_container_width=True):
-                json_str = json.dumps(st.session_state.roadmap, indent=2)
+                entry = get_roadmap_cache().lookup(st.session_state.roadmap)
+                json_str = entry["export"] if entry else json.dumps(st.session_state.roadmap, indent=2)
                 st.download_button(
                     "Download",
                     json_str,
@@ -592,6 +1147,12 @@ def render_sidebar():
                     use_container_width=True
                 )
         
+        if ADVISOR_SEARCH_ENABLED:
+            st.markdown("---")
+            
+            st.subheader("Search Past Sessions")
+            render_search_panel()
+        
         st.markdown("---")
         st.caption("Powered by AI • Demo Mode")
 
@@ -603,6 +1164,7 @@ def main():
     """Main application"""
     apply_custom_css()
     initialize_session_state()
+    cache = get_roadmap_cache()
     render_sidebar()
     
     st.title("PathFinder AI")
@@ -621,18 +1183,22 @@ def main():
                 st.write(msg["content"])
         
         if prompt := st.chat_input("Tell me about your career goals..."):
-            st.session_state.messages.append({"role": "user", "content": prompt})
+            generate = IntentDetector.should_generate(prompt, st.session_state.messages)
+            record_message(
+                "user", prompt,
+                career_goal=MockDataGenerator.detect_career_goal(prompt) if generate else None
+            )
             
             with st.chat_message("user"):
                 st.write(prompt)
             
             with st.chat_message("assistant"):
                 with st.spinner("Thinking..."):
-                    if IntentDetector.should_generate(prompt, st.session_state.messages[:-1]):
-                        roadmap = MockDataGenerator.generate_mock_roadmap(prompt)
+                    if generate:
+                        roadmap = cache.get_or_generate(prompt)
                         if roadmap:
                             st.session_state.roadmap = roadmap
-                            st.session_state.roadmap_history.append({"timestamp": datetime.now(), "roadmap": roadmap})
+                            record_roadmap(roadmap)
                             reply = f"✨ Created your roadmap for **{roadmap['career_goal']}**! Check the right panel to see your personalized plan."
                         else:
                             reply = "I had trouble creating your roadmap. Could you provide more details about your current skills and goals?"
@@ -641,7 +1207,7 @@ def main():
                     
                     st.write(reply)
             
-            st.session_state.messages.append({"role": "assistant", "content": reply})
+            record_message("assistant", reply)
             st.rerun()
     
     # RIGHT: Roadmap
@@ -649,7 +1215,8 @@ def main():
         st.subheader("Your Learning Roadmap")
         
         if st.session_state.roadmap:
-            RoadmapVisualizer.render_complete(st.session_state.roadmap)
+            entry = cache.lookup(st.session_state.roadmap)
+            RoadmapVisualizer.render_complete(st.session_state.roadmap, entry["fragments"] if entry else None)
         else:
             st.info("💬 Start a conversation to generate your personalized roadmap")
             